@@ -41,8 +41,10 @@ from sqlalchemy import (
     MetaData,
     UniqueConstraint,
     create_engine,
+    event,
     insert,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -400,13 +402,31 @@ class Run(Base):
         cov_query = np.full([size, size], np.nan, float)
         aln_length = np.full([size, size], np.nan, float)
         sim_errors = np.full([size, size], np.nan, float)
-        for comp in self.comparisons():
-            row = hashes.index(comp.query_hash)
-            col = hashes.index(comp.subject_hash)
-            identity[row, col] = comp.identity
-            cov_query[row, col] = comp.cov_query
-            aln_length[row, col] = comp.aln_length
-            sim_errors[row, col] = comp.sim_errors
+        # Select just the columns needed rather than full ORM objects, and
+        # fill the matrices column-wise (null values become NaN):
+        comparisons = (
+            self.comparisons()
+            .with_entities(
+                Comparison.query_hash,
+                Comparison.subject_hash,
+                Comparison.identity,
+                Comparison.cov_query,
+                Comparison.aln_length,
+                Comparison.sim_errors,
+            )
+            .all()
+        )
+        if comparisons:
+            index = {genome_hash: i for i, genome_hash in enumerate(hashes)}
+            query_hashes, subject_hashes, *values = zip(*comparisons, strict=True)
+            rows = np.fromiter((index[_] for _ in query_hashes), int, len(comparisons))
+            cols = np.fromiter(
+                (index[_] for _ in subject_hashes), int, len(comparisons)
+            )
+            for matrix, column in zip(
+                (identity, cov_query, aln_length, sim_errors), values, strict=True
+            ):
+                matrix[rows, cols] = np.array(column, dtype=float)
         # Hadamard matrix is (element wise) identity * coverage
         self.df_hadamard = pd.DataFrame(
             data=identity * cov_query, index=hashes, columns=hashes, dtype=float
@@ -510,23 +530,20 @@ class Run(Base):
             return None
         return pd.read_json(StringIO(self.df_hadamard), orient="split", dtype=float)
 
-    def relabelled_matrix(
-        self, matrix: pd.DataFrame, label: str = "md5"
-    ) -> pd.DataFrame:
-        """Convert a default MD5 based matrix of this run to another labelling.
+    def genome_labels(self, label: str = "md5") -> dict[str, str]:
+        """Return a mapping from the genome MD5 hashes of this run to the given labels.
 
-        Here the matrix argument could be from ``.identities`` or similar, while
-        the label can be "filename", "stem", or "md5" (default and a no-op).
+        The label can be "filename", "stem", or "md5" (default, an identity mapping).
 
         >>> run = Run()  # typically loaded from a DB
-        >>> unknown_sorted_idn = run.relabelled_matrix(run.identities, "unknown")
+        >>> run.genome_labels("unknown")
         Traceback (most recent call last):
         ...
         ValueError: Unexpected label scheme 'unknown'
         """
         if label == "md5":
-            return matrix
-        if label == "filename":
+            mapping = {_.genome_hash: _.genome_hash for _ in self.fasta_hashes}
+        elif label == "filename":
             mapping = {_.genome_hash: _.fasta_filename for _ in self.fasta_hashes}
             # Duplicate filenames should be impossible (blocked from creation
             # as we only accept a folder name as input)
@@ -543,6 +560,32 @@ class Run(Base):
         else:
             msg = f"Unexpected label scheme {label!r}"
             raise ValueError(msg)
+        return mapping
+
+    def relabelled_matrix(
+        self,
+        matrix: pd.DataFrame,
+        label: str = "md5",
+        mapping: dict[str, str] | None = None,
+    ) -> pd.DataFrame:
+        """Convert a default MD5 based matrix of this run to another labelling.
+
+        Here the matrix argument could be from ``.identities`` or similar, while
+        the label can be "filename", "stem", or "md5" (default and a no-op).
+
+        When relabelling several matrices, the mapping from ``.genome_labels()``
+        can be passed in to avoid recomputing it each time.
+
+        >>> run = Run()  # typically loaded from a DB
+        >>> unknown_sorted_idn = run.relabelled_matrix(run.identities, "unknown")
+        Traceback (most recent call last):
+        ...
+        ValueError: Unexpected label scheme 'unknown'
+        """
+        if label == "md5":
+            return matrix
+        if mapping is None:
+            mapping = self.genome_labels(label)
         matrix.rename(index=mapping, columns=mapping, inplace=True)  # noqa: PD002
         matrix.sort_index(axis=0, inplace=True)  # noqa: PD002
         matrix.sort_index(axis=1, inplace=True)  # noqa: PD002
@@ -557,6 +600,22 @@ class Run(Base):
         )
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:  # noqa: ANN001, ARG001
+    """Tune each new SQLite connection for our workload.
+
+    Keeps temporary tables and indexes (e.g. from sorting) in RAM, and allows
+    a larger page cache (negative values are in KiB, so 64MB) than the 2MB
+    default. We deliberately leave the journal mode and synchronous setting
+    alone, as WAL mode does not work on network filesystems (common on
+    clusters), and relaxing synchronous under the default rollback journal
+    risks corrupting the database on power loss.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
+
 def connect_to_db(dbpath: Path | str, *, echo: bool = False) -> Session:
     """Create/connect to existing DB, and return session bound to it.
 
@@ -576,6 +635,7 @@ def connect_to_db(dbpath: Path | str, *, echo: bool = False) -> Session:
     engine = create_engine(
         url=f"sqlite:///{dbpath!s}", echo=echo, connect_args={"timeout": 10}
     )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
     Base.metadata.create_all(engine)
     return sessionmaker(bind=engine)()
 
@@ -658,7 +718,42 @@ def db_configuration(  # noqa: PLR0913
     return config
 
 
-def db_genome(  # noqa: C901
+def _new_genome(fasta_filename: Path | str, md5: str) -> Genome:
+    """Return a new genome table entry, with the length and description from the FASTA.
+
+    FASTA files with gzip compression are fine, but must have the .gz extension.
+    """
+    length = 0
+    description = None
+
+    try:
+        with gzip.open(fasta_filename, "rt") as handle:
+            for title, seq in SimpleFastaParser(handle):
+                length += len(seq)
+                if description is None:
+                    description = title  # Just use first entry
+            if not str(fasta_filename).endswith(".gz"):
+                msg = f"ERROR: No .gz ending, but {Path(fasta_filename).name} is gzip compressed"
+                sys.exit(msg)
+    except gzip.BadGzipFile:
+        if str(fasta_filename).endswith(".gz"):
+            msg = f"ERROR: Has .gz ending, but {Path(fasta_filename).name} is NOT gzip compressed"
+            sys.exit(msg)
+        with Path(fasta_filename).open() as handle:
+            for title, seq in SimpleFastaParser(handle):
+                length += len(seq)
+                if description is None:
+                    description = title  # Just use first entry
+
+    return Genome(
+        genome_hash=md5,
+        path=str(fasta_filename),
+        length=length,
+        description=description,
+    )
+
+
+def db_genome(
     session: Session, fasta_filename: Path | str, md5: str, *, create: bool = False
 ) -> Genome:
     """Return a genome table entry, or add and return it if not already there.
@@ -696,34 +791,7 @@ def db_genome(  # noqa: C901
         msg = "Requested genome not already in DB"
         raise NoResultFound(msg)
 
-    length = 0
-    description = None
-
-    try:
-        with gzip.open(fasta_filename, "rt") as handle:
-            for title, seq in SimpleFastaParser(handle):
-                length += len(seq)
-                if description is None:
-                    description = title  # Just use first entry
-            if not str(fasta_filename).endswith(".gz"):
-                msg = f"ERROR: No .gz ending, but {Path(fasta_filename).name} is gzip compressed"
-                sys.exit(msg)
-    except gzip.BadGzipFile:
-        if str(fasta_filename).endswith(".gz"):
-            msg = f"ERROR: Has .gz ending, but {Path(fasta_filename).name} is NOT gzip compressed"
-            sys.exit(msg)
-        with Path(fasta_filename).open() as handle:
-            for title, seq in SimpleFastaParser(handle):
-                length += len(seq)
-                if description is None:
-                    description = title  # Just use first entry
-
-    genome = Genome(
-        genome_hash=md5,
-        path=str(fasta_filename),
-        length=length,
-        description=description,
-    )
+    genome = _new_genome(fasta_filename, md5)
 
     # Recheck database as all that file access is slow and another thread
     # may have added it in the meantime
@@ -737,6 +805,46 @@ def db_genome(  # noqa: C901
     return genome
 
 
+def add_genomes(session: Session, fasta_to_hash: dict[Path, str]) -> None:
+    """Add any of the given genomes not already in the genome table.
+
+    Assumes and trusts the MD5 checksums given match, and unlike calling
+    ``db_genome`` for each file this uses a single transaction:
+
+    >>> session = connect_to_db(":memory:")
+    >>> from pyani_plus.utils import file_md5sum
+    >>> fasta = Path("tests/fixtures/viral_example/OP073605.fasta")
+    >>> add_genomes(session, {fasta: file_md5sum(fasta)})
+    >>> session.query(Genome).one().genome_hash
+    '5584c7029328dc48d33f95f0a78f7e57'
+
+    Any pre-existing genome entries are left as is, including any which
+    competing processes add at the same time.
+    """
+    existing = {
+        _
+        for (_,) in session.query(Genome.genome_hash).where(
+            Genome.genome_hash.in_(set(fasta_to_hash.values()))
+        )
+    }
+    new_genomes = {}
+    for filename, md5 in fasta_to_hash.items():
+        if md5 not in existing and md5 not in new_genomes:
+            genome = _new_genome(filename, md5)
+            new_genomes[md5] = {
+                "genome_hash": md5,
+                "path": genome.path,
+                "length": genome.length,
+                "description": genome.description,
+            }
+    if new_genomes:
+        session.execute(
+            sqlite_insert(Genome).on_conflict_do_nothing(),
+            list(new_genomes.values()),
+        )
+    session.commit()
+
+
 def add_run(  # noqa: PLR0913
     session: Session,
     configuration: Configuration,
@@ -821,7 +929,8 @@ def load_run(
                 f" comparisons, {n**2 - done} needed"
             )
             raise SystemExit(msg)
-        if run.identities is None:
+        # Check the cached JSON directly rather than parsing it into a matrix
+        if run.df_identity is None:
             run.cache_comparisons()
             session.commit()
 
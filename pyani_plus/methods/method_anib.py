@@ -72,15 +72,16 @@ def fragment_fasta_file(
     ):
         count = 0
         for title, seq in SimpleFastaParser(in_handle):
-            index = 0
-            while index < len(seq):
+            for index in range(0, len(seq), fragsize):
                 count += 1
                 fragment = seq[index : index + fragsize]
-                out_handle.write(f">frag{count:05d} {title}\n")
-                # Now line wrap at 60 chars
-                for i in range(0, len(fragment), 60):
-                    out_handle.write(fragment[i : i + 60] + "\n")
-                index += fragsize
+                # Line wrap at 60 chars, writing each whole record in one call
+                out_handle.write(
+                    f">frag{count:05d} {title}\n"
+                    + "".join(
+                        f"{fragment[i : i + 60]}\n" for i in range(0, len(fragment), 60)
+                    )
+                )
     if not count:
         msg = f"No sequences found in {filename}"
         raise ValueError(msg)
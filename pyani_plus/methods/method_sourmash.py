@@ -26,6 +26,8 @@ import sys
 from collections.abc import Iterator
 from pathlib import Path
 
+import pandas as pd
+
 SCALED = 1000
 KMER_SIZE = 31  # default
 
@@ -93,47 +95,57 @@ def parse_sourmash_manysearch_csv(
     using reporting threshold zero, this only applies to corner cases where
     there are no common k-mers.
     """
-    column_query = column_subject = column_query_cont = column_max_cont = 0
     with manysearch_file.open() as handle:
         line = handle.readline().rstrip("\n")
-        headers = line.split(",")
-        try:
-            # In branchwater 0.9.11 column order varies between manysearch and pairwise
-            column_query = headers.index("query_name")
-            column_subject = headers.index("match_name")
-            column_query_cont = headers.index("query_containment_ani")
-            column_max_cont = headers.index("max_containment_ani")
-        except ValueError:
-            msg = f"ERROR - Missing expected fields in sourmash manysearch header: {line!r}"
-            sys.exit(msg)
-        for line in handle:
-            line = line.rstrip("\n")  # noqa: PLW2901
-            if not line:
-                continue
-            values = line.split(",")
-            if (
-                values[column_query] == values[column_subject]
-                and values[column_max_cont] != "1.0"
-            ):
-                msg = (
-                    f"Expected sourmash manysearch {filename_to_hash[values[column_query]]}"
-                    f" vs self to be one, not {values[column_max_cont]!r}"
-                )
-                raise ValueError(msg)
-            query_hash = filename_to_hash[values[column_query]]
-            subject_hash = filename_to_hash[values[column_subject]]
-            if (query_hash, subject_hash) in expected_pairs:
-                expected_pairs.remove((query_hash, subject_hash))
-            else:
-                msg = f"Did not expect {query_hash} vs {subject_hash} in {manysearch_file.name}"
-                raise ValueError(msg)
-            yield (
-                query_hash,
-                subject_hash,
-                float(values[column_query_cont]),
-                float(values[column_max_cont]),
-            )
+    headers = line.split(",")
+    # In branchwater 0.9.11 column order varies between manysearch and pairwise
+    columns = [
+        "query_name",
+        "match_name",
+        "query_containment_ani",
+        "max_containment_ani",
+    ]
+    if not set(columns).issubset(headers):
+        msg = f"ERROR - Missing expected fields in sourmash manysearch header: {line!r}"
+        sys.exit(msg)
+    data = pd.read_csv(
+        manysearch_file,
+        usecols=columns,
+        dtype={
+            "query_name": str,
+            "match_name": str,
+            "query_containment_ani": "float64",
+            "max_containment_ani": "float64",
+        },
+    )
+    bad_self = data[
+        (data["query_name"] == data["match_name"])
+        & (data["max_containment_ani"] != 1.0)
+    ]
+    if len(bad_self):
+        query_name = bad_self["query_name"].iloc[0]
+        max_cont = float(bad_self["max_containment_ani"].iloc[0])
+        msg = (
+            f"Expected sourmash manysearch {filename_to_hash[query_name]}"
+            f" vs self to be one, not {max_cont!r}"
+        )
+        raise ValueError(msg)
+    # Converting each whole column to a list of Python strings or floats in
+    # one go is much faster than boxing each value of each row via itertuples
+    for query_name, subject_name, query_cont, max_cont in zip(
+        *(data[_].tolist() for _ in columns), strict=True
+    ):
+        query_hash = filename_to_hash[query_name]
+        subject_hash = filename_to_hash[subject_name]
+        if (query_hash, subject_hash) in expected_pairs:
+            expected_pairs.remove((query_hash, subject_hash))
+        else:
+            msg = f"Did not expect {query_hash} vs {subject_hash} in {manysearch_file.name}"
+            raise ValueError(msg)
+        yield query_hash, subject_hash, query_cont, max_cont
     # Even if the file was empty (bar the header),
     # we infer any remaining pairs are failed alignments:
-    for query_hash, subject_hash in expected_pairs:
-        yield query_hash, subject_hash, None, None
+    yield from (
+        (query_hash, subject_hash, None, None)
+        for query_hash, subject_hash in expected_pairs
+    )
@@ -0,0 +1,177 @@
+# The MIT License
+#
+# Copyright (c) 2024-2025 University of Strathclyde
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""Code for plotting a single run (heatmaps etc)."""
+
+import csv
+import io
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from math import isnan
+from pathlib import Path
+
+import fastcluster
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from PIL import Image
+from scipy.cluster.hierarchy import leaves_list
+
+# We only ever write image files, so use the non-interactive Agg backend
+# rather than letting matplotlib probe for and load a GUI toolkit:
+mpl.use("Agg")
+
+# Vector formats get a rasterized heatmap mesh, thus a single bitmap embedded
+# in the file rather than one rectangle per comparison:
+IMAGE_FORMATS = ("png", "jpg", "svg", "pdf")
+
+
+def write_reordered_tsv(
+    matrix: pd.DataFrame, order: np.ndarray, filename: Path
+) -> None:
+    """Write the matrix to TSV with rows and columns in the given order.
+
+    Gives the same output as ``matrix.iloc[order, order].to_csv(...)`` with a tab
+    separator, but streamed a row at a time rather than first making a reordered
+    copy of the whole matrix.
+    """
+    values = matrix.to_numpy()
+    with filename.open("w", newline="") as handle:
+        writer = csv.writer(handle, delimiter="\t", lineterminator="\n")
+        writer.writerow(["", *matrix.columns[order]])
+        for label, row in zip(matrix.index[order], values[order], strict=True):
+            writer.writerow(
+                [label, *("" if isnan(_) else _ for _ in row[order].tolist())]
+            )
+
+
+def cluster_matrix(matrix: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Return the row and column linkages for clustering the matrix.
+
+    Uses the C++ fastcluster library rather than scipy, matching the default
+    seaborn clustering on rows and columns (average linkage of Euclidean
+    distances). Requires at least two rows/columns.
+    """
+    values = matrix.to_numpy()
+    return (
+        fastcluster.linkage(values, method="average"),
+        fastcluster.linkage(values.T, method="average"),
+    )
+
+
+def plot_heatmap(
+    matrix: pd.DataFrame,
+    outdir: Path,
+    method: str,
+    name: str,
+    linkages: tuple[np.ndarray, np.ndarray] | None = None,
+) -> None:
+    """Plot a clustered heatmap of the matrix, plus the reordered matrix as TSV.
+
+    The output files will be named <method>_<name>.<extension>, and any
+    pre-existing files will be overwritten.
+
+    Optionally the row and column linkages from ``cluster_matrix`` can be
+    given, e.g. to reuse the clustering of another matrix for the same genomes.
+    """
+    # Single precision is plenty for the colour mapping, and halves the memory
+    # used by the copies seaborn makes. Clustering and the TSV use the original.
+    plot_data = matrix.astype(np.float32)
+    if len(matrix) > 1:
+        if linkages is None:
+            linkages = cluster_matrix(matrix)
+        row_linkage, col_linkage = linkages
+        # Same as the figure's dendrogram_row.reordered_ind
+        order = leaves_list(row_linkage)
+        figure = sns.clustermap(
+            plot_data, row_linkage=row_linkage, col_linkage=col_linkage
+        )
+    else:
+        # Nothing to cluster
+        order = np.arange(len(matrix))
+        figure = sns.clustermap(plot_data, row_cluster=False, col_cluster=False)
+    figure.ax_heatmap.collections[0].set_rasterized(True)
+
+    # Apply the clustering reordering to match the figure:
+    write_reordered_tsv(matrix, order, outdir / f"{method}_{name}.tsv")
+
+    png = b""
+    for ext in IMAGE_FORMATS:
+        filename = outdir / f"{method}_{name}.{ext}"
+        # Render into memory and write each file in one go, rather than as
+        # many small writes which are slow on network filesystems:
+        buffer = io.BytesIO()
+        if ext == "png":
+            # Fast zlib level, larger files but several times quicker to encode
+            figure.savefig(buffer, format=ext, pil_kwargs={"compress_level": 1})
+            png = buffer.getvalue()
+        elif ext == "jpg":
+            # Reuse the PNG bitmap rather than rendering the figure again
+            with Image.open(io.BytesIO(png)) as image:
+                image.convert("RGB").save(
+                    buffer, format="jpeg", quality=85, optimize=False
+                )
+        else:
+            figure.savefig(buffer, format=ext)
+        filename.write_bytes(buffer.getvalue())
+
+    # clustermap always makes a new figure, so free it rather than letting
+    # pyplot keep every heatmap drawn by this process alive:
+    plt.close(figure.figure)
+
+
+def plot_heatmaps(
+    matrices: dict[str, pd.DataFrame], outdir: Path, method: str, cores: int = 1
+) -> None:
+    """Plot heatmaps for each named matrix, in parallel if given multiple cores.
+
+    The genomes are clustered once using the first matrix (normally identity),
+    and all the heatmaps share that ordering.
+
+    Each heatmap is independent and matplotlib rendering is CPU bound (and not
+    thread safe), so this uses a separate worker process per matrix.
+    """
+    first = next(iter(matrices.values()), None)
+    linkages = cluster_matrix(first) if first is not None and len(first) > 1 else None
+
+    workers = min(len(matrices), cores)
+    if workers <= 1:
+        for name, matrix in matrices.items():
+            plot_heatmap(matrix, outdir, method, name, linkages)
+        return
+
+    # As of Python 3.8 onwards, the default on macOS ("Darwin") is "spawn"
+    # As of Python 3.12, the default of "fork" on Linux triggers a deprecation warning.
+    # Note mypy currently can't handle this dynamic situation, their issue #8603
+    context = multiprocessing.get_context(  # type:ignore [attr-defined]
+        "spawn" if sys.platform == "darwin" else "forkserver"
+    )
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(plot_heatmap, matrix, outdir, method, name, linkages)
+            for name, matrix in matrices.items()
+        ]
+        for future in futures:
+            # Re-raises any exception from the worker
+            future.result()
@@ -33,6 +33,7 @@ import signal
 import sys
 import tempfile
 from contextlib import nullcontext
+from itertools import product
 from pathlib import Path
 from typing import Annotated
 
@@ -56,7 +57,12 @@ from pyani_plus.public_cli_args import (
     REQ_ARG_TYPE_DATABASE,
     REQ_ARG_TYPE_FASTA_DIR,
 )
-from pyani_plus.utils import check_fasta, check_output, file_md5sum
+from pyani_plus.utils import (
+    check_db,
+    check_fasta,
+    check_output,
+    file_md5sums,
+)
 
 app = typer.Typer(
     context_settings={"help_option_names": ["-h", "--help"]},
@@ -179,6 +185,15 @@ def _check_tool_version(
         sys.exit(msg)
 
 
+def _genome_lengths(session: Session, hashes: list[str]) -> dict[str, int]:
+    """Return a dict of the given genome hashes to their lengths, from one query."""
+    return dict(
+        session.query(db_orm.Genome.genome_hash, db_orm.Genome.length)
+        .where(db_orm.Genome.genome_hash.in_(hashes))
+        .all()
+    )
+
+
 @app.command(rich_help_panel="Low-level logging")
 def log_configuration(  # noqa: PLR0913
     database: REQ_ARG_TYPE_DATABASE,
@@ -197,9 +212,7 @@ def log_configuration(  # noqa: PLR0913
 
     Any pre-existing configuration entry is left as is.
     """
-    if database != ":memory:" and not create_db and not Path(database).is_file():
-        msg = f"ERROR: Database {database} does not exist, but not using --create-db"
-        sys.exit(msg)
+    check_db(database, create_db)
 
     print(f"Logging configuration to {database}")
     session = db_orm.connect_to_db(database)
@@ -233,21 +246,23 @@ def log_genome(
 
     Any pre-existing duplicate FASTA entries are left as is.
     """
-    if database != ":memory:" and not create_db and not Path(database).is_file():
-        msg = f"ERROR: Database {database} does not exist, but not using --create-db"
-        sys.exit(msg)
+    check_db(database, create_db)
 
     print(f"Logging genome to {database}")
     session = db_orm.connect_to_db(database)
 
-    file_total = 0
+    fasta_to_hash = {}
     if fasta:
         with Progress(*PROGRESS_BAR_COLUMNS) as progress:
-            for filename in progress.track(fasta, description="Processing..."):
-                file_total += 1
-                md5 = file_md5sum(filename)
-                db_orm.db_genome(session, filename, md5, create=True)
-    session.commit()
+            fasta_to_hash = dict(
+                progress.track(
+                    zip(fasta, file_md5sums(fasta), strict=True),
+                    total=len(fasta),
+                    description="Processing...",
+                )
+            )
+        db_orm.add_genomes(session, fasta_to_hash)
+    file_total = len(fasta_to_hash)
     session.close()
     print(f"Processed {file_total} FASTA files")
 
@@ -280,9 +295,7 @@ def log_run(  # noqa: PLR0913
     comparisons have been completed and you want to refresh the cached matrices
     and update the run status).
     """
-    if database != ":memory:" and not create_db and not Path(database).is_file():
-        msg = f"ERROR: Database {database} does not exist, but not using --create-db"
-        sys.exit(msg)
+    check_db(database, create_db)
 
     print(f"Logging run to {database}")
     session = db_orm.connect_to_db(database)
@@ -306,10 +319,14 @@ def log_run(  # noqa: PLR0913
     if fasta_names:
         # Reuse existing genome entries and/or log new ones
         with Progress(*PROGRESS_BAR_COLUMNS) as progress:
-            for filename in progress.track(fasta_names, description="Processing..."):
-                md5 = file_md5sum(filename)
-                fasta_to_hash[filename] = md5
-                db_orm.db_genome(session, filename, md5, create=True)
+            fasta_to_hash = dict(
+                progress.track(
+                    zip(fasta_names, file_md5sums(fasta_names), strict=True),
+                    total=len(fasta_names),
+                    description="Processing...",
+                )
+            )
+        db_orm.add_genomes(session, fasta_to_hash)
 
     run = db_orm.add_run(
         session,
@@ -364,22 +381,30 @@ def log_comparison(  # noqa: PLR0913
         msg = f"ERROR - {database} does not contain configuration_id={config_id}"
         sys.exit(msg)
 
-    query_md5 = file_md5sum(query_fasta)
+    query_md5, subject_md5 = file_md5sums([query_fasta, subject_fasta])
     db_orm.db_genome(session, query_fasta, query_md5)
-
-    subject_md5 = file_md5sum(subject_fasta)
     db_orm.db_genome(session, subject_fasta, subject_md5)
 
-    db_orm.db_comparison(
-        session,
-        configuration_id=config_id,
-        query_hash=query_md5,
-        subject_hash=subject_md5,
-        identity=identity,
-        aln_length=aln_length,
-        sim_errors=sim_errors,
-        cov_query=cov_query,
-        cov_subject=cov_subject,
+    # Single Core statement rather than an ORM lookup then insert,
+    # any pre-existing entry is left as is (as with db_comparison):
+    uname = platform.uname()
+    session.execute(
+        sqlite_insert(db_orm.Comparison).on_conflict_do_nothing(),
+        [
+            {
+                "configuration_id": config_id,
+                "query_hash": query_md5,
+                "subject_hash": subject_md5,
+                "identity": identity,
+                "aln_length": aln_length,
+                "sim_errors": sim_errors,
+                "cov_query": cov_query,
+                "cov_subject": cov_subject,
+                "uname_system": uname.system,
+                "uname_release": uname.release,
+                "uname_machine": uname.machine,
+            }
+        ],
     )
 
     session.commit()
@@ -432,8 +457,14 @@ def compute_column(  # noqa: C901
     config = run.configuration
     method = config.method
 
-    filename_to_hash = {_.fasta_filename: _.genome_hash for _ in run.fasta_hashes}
-    hash_to_filename = {_.genome_hash: _.fasta_filename for _ in run.fasta_hashes}
+    # Single query for both mappings, sorted by hash as used for column numbers:
+    hash_to_filename = dict(
+        run.fasta_hashes.with_entities(
+            db_orm.RunGenomeAssociation.genome_hash,
+            db_orm.RunGenomeAssociation.fasta_filename,
+        ).order_by(db_orm.RunGenomeAssociation.genome_hash)
+    )
+    filename_to_hash = {v: k for k, v in hash_to_filename.items()}
     n = len(hash_to_filename)
 
     if subject in hash_to_filename:
@@ -453,16 +484,17 @@ def compute_column(  # noqa: C901
             if not quiet:
                 sys.stderr.write("INFO: Treating subject N as 0 (first column)\n")
             column = 0
-        subject_hash = sorted(hash_to_filename)[column]
+        subject_hash = list(hash_to_filename)[column]
         del column
 
     # What comparisons are needed?
+    # (fetching just the query hashes already done, not whole Comparison rows)
     query_hashes: list[str] = sorted(
         set(hash_to_filename).difference(
-            comp.query_hash
-            for comp in run.comparisons().where(
-                db_orm.Comparison.subject_hash == subject_hash
-            )
+            query_hash
+            for (query_hash,) in run.comparisons()
+            .where(db_orm.Comparison.subject_hash == subject_hash)
+            .with_entities(db_orm.Comparison.query_hash)
         )
     )
 
@@ -642,12 +674,8 @@ def anim(  # noqa: C901, PLR0912, PLR0913, PLR0915
         msg = f"ERROR: ANIm run-id {run.run_id} is missing mode parameter"
         sys.exit(msg)
 
-    subject_length = (
-        session.query(db_orm.Genome)
-        .where(db_orm.Genome.genome_hash == subject_hash)
-        .one()
-        .length
-    )
+    lengths = _genome_lengths(session, [*query_hashes, subject_hash])
+    subject_length = lengths[subject_hash]
     if hash_to_filename[subject_hash].endswith(".gz"):
         # We must decompress the subject FASTA file for nucmer
         subject_fasta = tmp_dir / hash_to_filename[subject_hash][:-3]
@@ -664,12 +692,7 @@ def anim(  # noqa: C901, PLR0912, PLR0913, PLR0915
     db_entries = []
     try:
         for query_hash in query_hashes:
-            query_length = (
-                session.query(db_orm.Genome)
-                .where(db_orm.Genome.genome_hash == query_hash)
-                .one()
-                .length
-            )
+            query_length = lengths[query_hash]
             if hash_to_filename[query_hash].endswith(".gz"):
                 # We must decompress the query FASTA file for nucmer
                 # (although we can reuse the subject file for self-vs-self)
@@ -810,12 +833,8 @@ def anib(  # noqa: C901,PLR0913,PLR0915
     if not fragsize:
         msg = f"ERROR: ANIb run-id {run.run_id} is missing fragsize parameter"
         sys.exit(msg)
-    subject_length = (
-        session.query(db_orm.Genome)
-        .where(db_orm.Genome.genome_hash == subject_hash)
-        .one()
-        .length
-    )
+    lengths = _genome_lengths(session, [*query_hashes, subject_hash])
+    subject_length = lengths[subject_hash]
     outfmt = "6 " + " ".join(method_anib.BLAST_COLUMNS)
 
     if hash_to_filename[subject_hash].endswith(".gz"):
@@ -902,12 +921,7 @@ def anib(  # noqa: C901,PLR0913,PLR0915
 
             identity, aln_length, sim_errors = method_anib.parse_blastn_file(tmp_tsv)
 
-            query_length = (
-                session.query(db_orm.Genome)
-                .where(db_orm.Genome.genome_hash == query_hash)
-                .one()
-                .length
-            )
+            query_length = lengths[query_hash]
 
             db_entries.append(
                 {
@@ -982,6 +996,7 @@ def dnadiff(  # noqa: C901, PLR0912, PLR0913, PLR0915
     _check_tool_version(nucmer, run.configuration)
 
     config_id = run.configuration.configuration_id
+    lengths = _genome_lengths(session, query_hashes)
     if hash_to_filename[subject_hash].endswith(".gz"):
         # We must decompress the subject FASTA file for nucmer
         subject_fasta = tmp_dir / hash_to_filename[subject_hash][:-3]
@@ -998,12 +1013,7 @@ def dnadiff(  # noqa: C901, PLR0912, PLR0913, PLR0915
     db_entries = []
     try:
         for query_hash in query_hashes:
-            query_length = (
-                session.query(db_orm.Genome)
-                .where(db_orm.Genome.genome_hash == query_hash)
-                .one()
-                .length
-            )
+            query_length = lengths[query_hash]
             if hash_to_filename[query_hash].endswith(".gz"):
                 # We must decompress the query FASTA file for nucmer
                 # (although we can reuse the subject file for self-vs-self)
@@ -1273,6 +1283,7 @@ def log_branchwater(
 
     config_id = run.configuration.configuration_id
     filename_to_hash = {_.fasta_filename: _.genome_hash for _ in run.fasta_hashes}
+    hashes = list(filename_to_hash.values())
 
     # Now do a bulk import... but must skip any pre-existing entries
     # otherwise would hit sqlite3.IntegrityError for breaking uniqueness!
@@ -1301,11 +1312,7 @@ def log_branchwater(
                 manysearch,
                 filename_to_hash,
                 # This is used to infer failed alignments:
-                expected_pairs={
-                    (q, s)
-                    for q in filename_to_hash.values()
-                    for s in filename_to_hash.values()
-                },
+                expected_pairs=set(product(hashes, repeat=2)),
             )
         ],
     )
@@ -34,11 +34,13 @@ from pathlib import Path
 from typing import Annotated
 
 import click
+import numpy as np
 import typer
 from rich.console import Console
 from rich.progress import Progress
 from rich.table import Table
 from rich.text import Text
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from pyani_plus import PROGRESS_BAR_COLUMNS, db_orm, tools
@@ -63,7 +65,7 @@ from pyani_plus.utils import (
     available_cores,
     check_db,
     check_fasta,
-    file_md5sum,
+    file_md5sums,
 )
 from pyani_plus.workflows import (
     ShowProgress,
@@ -120,8 +122,11 @@ def start_and_run_method(  # noqa: PLR0913
     filename_to_md5 = {}
     hashes = set()
     with Progress(*PROGRESS_BAR_COLUMNS) as progress:
-        for filename in progress.track(fasta_names, description="Indexing FASTAs"):
-            md5 = file_md5sum(filename)
+        for filename, md5 in progress.track(
+            zip(fasta_names, file_md5sums(fasta_names), strict=True),
+            total=len(fasta_names),
+            description="Indexing FASTAs",
+        ):
             filename_to_md5[filename] = md5
             if md5 in hashes:
                 # This avoids hitting IntegrityError UNIQUE constraint failed
@@ -131,7 +136,7 @@ def start_and_run_method(  # noqa: PLR0913
                 msg = f"ERROR - Multiple genomes with same MD5 checksum {md5}:{dups}"
                 sys.exit(msg)
             hashes.add(md5)
-            db_orm.db_genome(session, filename, md5, create=True)
+    db_orm.add_genomes(session, filename_to_md5)
 
     # New run
     run = db_orm.add_run(
@@ -539,11 +544,12 @@ def resume(  # noqa: C901, PLR0912, PLR0915
         run_id = run.run_id  # relevant if was None
         print(f"INFO: Resuming run-id {run_id}")
     config = run.configuration
+    n = run.genomes.count()
     print(
-        f"INFO: This is a {config.method} run on {run.genomes.count()} genomes, "
+        f"INFO: This is a {config.method} run on {n} genomes, "
         f"using {config.program} version {config.version}"
     )
-    if not run.genomes.count():
+    if not n:
         msg = f"ERROR: No genomes recorded for run-id {run_id}, cannot resume."
         sys.exit(msg)
 
@@ -661,10 +667,10 @@ def list_runs(
         sys.exit(msg)
 
     session = db_orm.connect_to_db(database)
-    runs = session.query(db_orm.Run)
+    runs = session.query(db_orm.Run).all()
 
     table = Table(
-        title=f"{runs.count()} analysis runs in {database}",
+        title=f"{len(runs)} analysis runs in {database}",
         row_styles=["dim", ""],  # alternating zebra stripes
     )
     table.add_column("ID", justify="right", no_wrap=True)
@@ -682,9 +688,13 @@ def list_runs(
         conf = run.configuration
         n = run.genomes.count()
         total = n**2
-        done = run.comparisons().count()
-        # Using is None does not work as expected, must use == None
-        nulls = run.comparisons().where(db_orm.Comparison.identity == None).count()  # noqa: E711
+        # One query for both counts, as count(identity) skips nulls:
+        done, non_nulls = (
+            run.comparisons()
+            .with_entities(func.count(), func.count(db_orm.Comparison.identity))
+            .one()
+        )
+        nulls = done - non_nulls
         table.add_row(
             str(run.run_id),
             str(run.date.date()),
@@ -742,6 +752,12 @@ def export_run(
     # Question: Should we include the run-id in the filenames name?
     # Question: Should we match the property in filenames to old pyANI (e.g. coverage)?
     method = run.configuration.method
+    try:
+        # No need to query the genomes for the default MD5 labels (a no-op):
+        mapping = None if label == "md5" else run.genome_labels(label)
+    except ValueError as err:
+        msg = f"ERROR: {err}"
+        sys.exit(msg)
 
     for matrix, filename in (
         (run.identities, f"{method}_identity.tsv"),
@@ -755,12 +771,7 @@ def export_run(
             msg = f"ERROR: Could not load run {method} matrix"  # pragma: no cover
             sys.exit(msg)  # pragma: no cover
 
-        try:
-            matrix = run.relabelled_matrix(matrix, label)  # noqa: PLW2901
-        except ValueError as err:
-            msg = f"ERROR: {err}"
-            sys.exit(msg)
-
+        matrix = run.relabelled_matrix(matrix, label, mapping)  # noqa: PLW2901
         matrix.to_csv(outdir / filename, sep="\t")
 
     print(f"Wrote matrices to {outdir}/{method}_*.tsv")
@@ -770,7 +781,7 @@ def export_run(
 
 
 @app.command()
-def plot_run(  # noqa: C901
+def plot_run(
     database: REQ_ARG_TYPE_DATABASE,
     outdir: REQ_ARG_TYPE_OUTDIR,
     run_id: OPT_ARG_TYPE_RUN_ID = None,
@@ -803,8 +814,14 @@ def plot_run(  # noqa: C901
         print(f"INFO: Plotting run-id {run_id}")
 
     method = run.configuration.method
+    try:
+        # No need to query the genomes for the default MD5 labels (a no-op):
+        mapping = None if label == "md5" else run.genome_labels(label)
+    except ValueError as err:
+        msg = f"ERROR: {err}"
+        sys.exit(msg)
 
-    heatmaps_done = 0
+    matrices = {}
     for matrix, name in (
         (run.identities, "identity"),
         (run.cov_query, "query_cov"),
@@ -815,7 +832,8 @@ def plot_run(  # noqa: C901
             msg = f"ERROR: Could not load run {method} matrix"  # pragma: no cover
             sys.exit(msg)  # pragma: no cover
 
-        nulls = int(matrix.isnull().sum().sum())
+        # Single pass over the float buffer, no intermediate DataFrame of bools
+        nulls = np.count_nonzero(np.isnan(matrix.to_numpy()))
         n = len(matrix)
         if nulls:
             msg = (
@@ -825,41 +843,15 @@ def plot_run(  # noqa: C901
             sys.stderr.write(msg)
             continue
 
-        try:
-            matrix = run.relabelled_matrix(matrix, label)  # noqa: PLW2901
-        except ValueError as err:
-            msg = f"ERROR: {err}"
-            sys.exit(msg)
-
-        # Next cluster the matrix & prepare the figure (move code to new file)
-        import warnings
+        matrices[name] = run.relabelled_matrix(matrix, label, mapping)
+        # Next want to plot distributions of the scores (scatter plots)
 
-        import seaborn as sns
+    heatmaps_done = len(matrices)
+    if heatmaps_done:
+        # Importing seaborn etc is slow, so only do this when needed:
+        from pyani_plus.plot_run import plot_heatmaps
 
-        with warnings.catch_warnings():
-            warnings.filterwarnings(
-                "ignore",
-                message=(
-                    "scipy.cluster: The symmetric non-negative hollow observation"
-                    " matrix looks suspiciously like an uncondensed distance matrix"
-                ),
-            )
-            figure = sns.clustermap(matrix)
-
-        for ext in ("tsv", "png", "jpg", "svg", "pdf"):
-            filename = outdir / f"{method}_{name}.{ext}"
-            if ext == "tsv":
-                # Apply the clustering reordering to match the figure:
-                matrix = matrix.iloc[  # noqa: PLW2901
-                    figure.dendrogram_row.reordered_ind,
-                    figure.dendrogram_row.reordered_ind,
-                ]
-                matrix.to_csv(filename, sep="\t")
-            else:
-                figure.savefig(filename)
-
-        heatmaps_done += 1
-        # Next want to plot distributions of the scores (scatter plots)
+        plot_heatmaps(matrices, outdir, method, cores=available_cores())
 
     if not heatmaps_done:
         msg = "ERROR: Unable to plot any heatmaps (check for nulls)"
@@ -32,6 +32,7 @@ reproducibility of results.
 import re
 import shutil
 import subprocess
+from functools import cache
 from pathlib import Path
 from typing import NamedTuple
 
@@ -62,15 +63,18 @@ def check_cmd(cmd: str | Path) -> Path:
     return Path(exe_str).absolute()
 
 
-def _get_path_and_version_output(
-    cmd: str | Path, args: list[str] | None = None
-) -> tuple[Path, str]:
-    """Determine path of command, run it with args, capture combined stdout and stderr."""
+@cache
+def _run_version_command(exe_path: Path, args: tuple[str, ...]) -> str:
+    """Run the command with args, capture combined stdout and stderr.
+
+    This is cached per process as the same tool is often checked more than once
+    (e.g. when setting up a run and then again for each column computed), and
+    the version output for a given binary will not change mid-run.
+    """
     # Might later need to add check=True as an optional argument,
     # e.g. NCBI legacy blast doesn't have a version option and uses return code 1.
-    exe_path = check_cmd(cmd)
     result = subprocess.run(
-        [str(exe_path), *(args if args else [])],
+        [str(exe_path), *args],
         shell=False,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
@@ -78,7 +82,15 @@ def _get_path_and_version_output(
         text=True,
     )
     assert isinstance(result.stdout, str)  # noqa: S101
-    return exe_path, result.stdout
+    return result.stdout
+
+
+def _get_path_and_version_output(
+    cmd: str | Path, args: list[str] | None = None
+) -> tuple[Path, str]:
+    """Determine path of command, run it with args, capture combined stdout and stderr."""
+    exe_path = check_cmd(cmd)
+    return exe_path, _run_version_command(exe_path, tuple(args) if args else ())
 
 
 def get_makeblastdb(cmd: str | Path = "makeblastdb") -> ExternalToolData:
@@ -26,6 +26,8 @@ import hashlib
 import os
 import subprocess
 import sys
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from pyani_plus import FASTA_EXTENSIONS
@@ -114,18 +116,15 @@ def file_md5sum(filename: Path | str) -> str:
     to the file contents (e.g. editing a description) will change the checksum.
     """
     fname = Path(filename)  # ensure we have a Path object
-    # We're ignoring the linter warning as not using MD5 for security:
-    # S324 Probable use of insecure hash functions in `hashlib`: `md5`
-    hash_md5 = hashlib.md5()  # noqa: S324
+    # Using file_digest reads into a reused buffer via readinto, rather than
+    # allocating a new bytes object for every chunk. Not using MD5 for security.
     try:
         try:
             with gzip.open(fname, "rb") as fhandle:
-                for chunk in iter(lambda: fhandle.read(65536), b""):
-                    hash_md5.update(chunk)
+                hash_md5 = hashlib.file_digest(fhandle, "md5")
         except gzip.BadGzipFile:
             with fname.open("rb") as fhandle:
-                for chunk in iter(lambda: fhandle.read(65536), b""):
-                    hash_md5.update(chunk)
+                hash_md5 = hashlib.file_digest(fhandle, "md5")
     except FileNotFoundError:
         msg = f"Input file {fname} is not a file or symlink"
         raise ValueError(msg) from None
@@ -133,6 +132,24 @@ def file_md5sum(filename: Path | str) -> str:
     return hash_md5.hexdigest()
 
 
+def file_md5sums(filenames: Sequence[Path | str]) -> Iterator[str]:
+    """Yield the MD5 checksum of each file in turn, computed in parallel.
+
+    Both zlib and hashlib release the GIL while working on large buffers, so
+    threads are enough to spread the work of ``file_md5sum`` over the cores:
+
+    >>> list(file_md5sums(["tests/fixtures/viral_example/OP073605.fasta"]))
+    ['5584c7029328dc48d33f95f0a78f7e57']
+    """
+    executor = ThreadPoolExecutor(max_workers=available_cores())
+    try:
+        yield from executor.map(file_md5sum, filenames)
+    finally:
+        # If the caller stops early (e.g. on finding a duplicate), don't wait
+        # for all the remaining queued files to be hashed:
+        executor.shutdown(cancel_futures=True)
+
+
 def available_cores() -> int:
     """How many CPU cores/threads are available to use."""
     try:
@@ -164,10 +181,9 @@ def check_fasta(fasta: Path) -> list[Path]:
         msg = f"ERROR: FASTA input {fasta} is not a directory"
         sys.exit(msg)
 
-    fasta_names: list[Path] = []
-    for pattern in FASTA_EXTENSIONS:
-        fasta_names.extend(fasta.glob("*" + pattern))
-        fasta_names.extend(fasta.glob("*" + pattern + ".gz"))
+    # Single pass over the directory listing, rather than a glob per extension
+    extensions = tuple(FASTA_EXTENSIONS.union(_ + ".gz" for _ in FASTA_EXTENSIONS))
+    fasta_names = [_ for _ in fasta.iterdir() if _.name.endswith(extensions)]
     if not fasta_names:
         msg = f"ERROR: No FASTA input genomes under {fasta} with extensions {', '.join(FASTA_EXTENSIONS)}"
         sys.exit(msg)
@@ -59,19 +59,17 @@ def check_input_stems(indir: str) -> dict[str, Path]:
     """
     extensions = tuple(FASTA_EXTENSIONS.union(_ + ".gz" for _ in FASTA_EXTENSIONS))
 
-    stems = [_.stem for _ in Path(indir).glob("*") if _.name.endswith(extensions)]
-
-    if len(stems) == len(set(stems)):
-        input_files = {
-            _.stem: _ for _ in Path(indir).glob("*") if _.name.endswith(extensions)
-        }
-    else:
-        duplicates = [
-            item for item in stems if stems.count(item) > 1 and item in set(stems)
-        ]
-        msg = (
-            f"Duplicated stems found for {sorted(set(duplicates))}. Please investigate."
-        )
+    # Single pass over the directory listing
+    input_files: dict[str, Path] = {}
+    duplicates = set()
+    for filename in Path(indir).iterdir():
+        if filename.name.endswith(extensions):
+            if filename.stem in input_files:
+                duplicates.add(filename.stem)
+            input_files[filename.stem] = filename
+
+    if duplicates:
+        msg = f"Duplicated stems found for {sorted(duplicates)}. Please investigate."
         raise ValueError(msg)
 
     return input_files
@@ -20,49 +20,68 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 """Snakemake workflow for sourmash-plugin-brakewater"""
+import csv
+from pathlib import Path
+
 from pyani_plus.workflows import check_input_stems
 
 indir_files = check_input_stems(config["indir"])
 
 
-def get_genomeA(wildcards):
-    return indir_files[wildcards.genomeA]
-
-
-def get_genomeB(wildcards):
-    return indir_files[wildcards.genomeB]
+# The sketch_csv rule writes the "fromfile" CSV listing all the genomes for the
+# sketch rule, using the FASTA filename as the signature name, as used by
+# log-branchwater. It is only needed until the sketches have been made.
+rule sketch_csv:
+    input:
+        [indir_files[genome] for genome in sorted(indir_files)],
+    output:
+        temp("{outdir}/sketches.csv"),
+    run:
+        with open(output[0], "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["name", "genome_filename", "protein_filename"])
+            for filename in input:
+                writer.writerow([Path(filename).name, filename, ""])
 
 
-# The sketch rule runs the branchwater equivalent of "sourmash sketch"
+# The sketch rule runs the branchwater equivalent of "sourmash sketch fromfile",
+# sketching all the genomes in one multi-threaded call into a single zip file
+# (rather than one process and one .sig file per genome).
 rule sketch:
     params:
         indir=config["indir"],
         outdir=config["outdir"],
         extra=config["extra"],  # This will consist of either `scaled=X` or `num=X`.
         kmersize=config["kmersize"],
+    threads: config["cores"]
     input:
-        genomeA=get_genomeA,
+        genomes=[indir_files[genome] for genome in sorted(indir_files)],
+        csv="{outdir}/sketches.csv",
     output:
-        "{outdir}/{genomeA}.sig",
+        "{outdir}/sketches.zip",
     shell:
-        "sourmash scripts singlesketch -I DNA -p 'k={params.kmersize},{params.extra}' {input} -o {output} > {output}.log 2>&1"
+        """
+        sourmash scripts manysketch -p 'dna,k={params.kmersize},{params.extra}' \
+            -c {threads} -o {output} {input.csv} > {output}.log 2>&1
+        """
 
 
-# The manysearch rule runs the branchwater equivalent of "sourmash compare"
+# The manysearch rule runs the branchwater equivalent of "sourmash compare",
+# multi-threaded over the all-vs-all pairs using the configured number of cores
 rule manysearch:
     params:
         db=config["db"],
         run_id=config["run_id"],
         outdir=config["outdir"],
         extra=config["extra"],  # This will consist of either `scaled=X` or `num=X`.
+    threads: config["cores"]
     input:
-        expand("{{outdir}}/{genome}.sig", genome=sorted(indir_files)),
+        "{outdir}/sketches.zip",
     output:
         "{outdir}/manysearch.csv",
     shell:
         """
-        sourmash sig collect --quiet -F csv -o all_sigs.csv {input} > {output}.log 2>&1 &&
-        sourmash scripts manysearch -m DNA --quiet -t 0 -o {output} all_sigs.csv all_sigs.csv >> {output}.log 2>&1 &&
+        sourmash scripts manysearch -m DNA --quiet -t 0 -c {threads} -o {output} {input} {input} > {output}.log 2>&1 &&
         .pyani-plus-private-cli log-branchwater --quiet \
             --database {params.db} --run-id {params.run_id} \
             --manysearch {output}
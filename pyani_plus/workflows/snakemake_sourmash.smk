@@ -20,21 +20,33 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 """Snakemake workflow for sourmash"""
+import csv
 from pathlib import Path
+
 from pyani_plus.workflows import check_input_stems
 
 indir_files = check_input_stems(config["indir"])
 
 
-def get_genomeA(wildcards):
-    return indir_files[wildcards.genomeA]
-
-
-def get_genomeB(wildcards):
-    return indir_files[wildcards.genomeB]
+# The sketch_csv rule writes the "fromfile" CSV listing all the genomes for the
+# sketch rule, using the FASTA filename as the signature name, as used by
+# log-sourmash. It is only needed until the sketches have been made.
+rule sketch_csv:
+    input:
+        [indir_files[genome] for genome in sorted(indir_files)],
+    output:
+        temp("{outdir}/sketches.csv"),
+    run:
+        with open(output[0], "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["name", "genome_filename", "protein_filename"])
+            for filename in input:
+                writer.writerow([Path(filename).name, filename, ""])
 
 
-# The sketch_dna rule runs the sourmach branchwater equivalent to "sourmash sketch"
+# The sketch rule runs "sourmash sketch fromfile", sketching all the genomes in
+# one call into a single zip file (rather than one process and one .sig file
+# per genome).
 rule sketch:
     params:
         indir=config["indir"],
@@ -42,11 +54,15 @@ rule sketch:
         extra=config["extra"],  # This will consist of either `scaled=X` or `num=X`.
         kmersize=config["kmersize"],
     input:
-        genomeA=get_genomeA,
+        genomes=[indir_files[genome] for genome in sorted(indir_files)],
+        csv="{outdir}/sketches.csv",
     output:
-        "{outdir}/{genomeA}.sig",
+        "{outdir}/sketches.zip",
     shell:
-        "sourmash scripts singlesketch -I DNA -p 'k={params.kmersize},{params.extra}' {input} -o {output} > {output}.log 2>&1"
+        """
+        sourmash sketch fromfile -p 'dna,k={params.kmersize},{params.extra}' \
+            -o {output} {input.csv} > {output}.log 2>&1
+        """
 
 
 rule compare:
@@ -57,7 +73,7 @@ rule compare:
         kmersize=config["kmersize"],
         extra=config["extra"],  # This will consist of either `scaled=X` or `num=X`.
     input:
-        expand("{{outdir}}/{genome}.sig", genome=sorted(indir_files)),
+        "{outdir}/sketches.zip",
     output:
         # e.g. sourmash_max-containment_k=31_scaled=300.csv
         #"{outdir}/sourmash_{params.mode}_k={params.kmersize}_{params.extra}.csv",
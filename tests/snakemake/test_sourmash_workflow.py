@@ -26,8 +26,10 @@ These tests are intended to be run from the repository root using:
 pytest -v or make test
 """
 
+import gzip
 import json
 import shutil  # We need this for filesystem operations
+import zipfile
 from pathlib import Path
 
 import pandas as pd
@@ -89,6 +91,19 @@ def compare_sourmash_sig_files(file1: Path, file2: Path) -> bool:
     return True
 
 
+def unzip_sourmash_sig_files(zip_file: Path, outdir: Path) -> dict[str, Path]:
+    """Unpack zipped signatures as .sig files named after their FASTA stems."""
+    sig_files = {}
+    with zipfile.ZipFile(zip_file) as archive:
+        for member in archive.namelist():
+            if member.endswith(".sig.gz"):
+                data = json.loads(gzip.decompress(archive.read(member)))
+                sig_file = outdir / f"{Path(data[0]['name']).stem}.sig"
+                sig_file.write_text(json.dumps(data))
+                sig_files[sig_file.name] = sig_file
+    return sig_files
+
+
 def compare_sourmash_ani_files(data1: Path, data2: Path) -> bool:
     """Compare two .csv files returned by sourmash compare."""
     # Read the .csv files into DataFrames
@@ -147,22 +162,23 @@ def test_sketch_rule(
     config["indir"] = input_genomes_tiny
 
     expected_sigs = list((input_genomes_tiny / "intermediates/sourmash").glob("*.sig"))
-    targets = [
-        sourmash_targets_signature_outdir / fname.name for fname in expected_sigs
-    ]
 
     # Run snakemake wrapper
     run_snakemake_with_progress_bar(
         executor=ToolExecutor.local,
         workflow_name="snakemake_sourmash.smk",
-        targets=targets,
+        targets=[sourmash_targets_signature_outdir / "sketches.zip"],
         params=config,
         working_directory=Path(tmp_path),
     )
 
     # Check output against target fixtures
-    for expected, generated in zip(expected_sigs, targets, strict=False):
-        assert compare_sourmash_sig_files(expected, generated)
+    generated = unzip_sourmash_sig_files(
+        sourmash_targets_signature_outdir / "sketches.zip", Path(tmp_path)
+    )
+    assert sorted(generated) == sorted(_.name for _ in expected_sigs)
+    for expected in expected_sigs:
+        assert compare_sourmash_sig_files(expected, generated[expected.name])
 
 
 def test_compare_rule(
@@ -310,20 +326,21 @@ def test_branchwater_sketch_rule(
     config["indir"] = input_genomes_tiny
 
     expected_sigs = list((input_genomes_tiny / "intermediates/sourmash").glob("*.sig"))
-    targets = [tmp_dir / "output" / fname.name for fname in expected_sigs]
 
     # Run snakemake wrapper
     run_snakemake_with_progress_bar(
         executor=ToolExecutor.local,
         workflow_name="snakemake_branchwater.smk",
-        targets=targets,
+        targets=[tmp_dir / "output/sketches.zip"],
         params=config,
         working_directory=Path(tmp_path),
     )
 
     # Check output against target fixtures
-    for expected, generated in zip(expected_sigs, targets, strict=False):
-        assert compare_sourmash_sig_files(expected, generated)
+    generated = unzip_sourmash_sig_files(tmp_dir / "output/sketches.zip", tmp_dir)
+    assert sorted(generated) == sorted(_.name for _ in expected_sigs)
+    for expected in expected_sigs:
+        assert compare_sourmash_sig_files(expected, generated[expected.name])
 
 
 def test_branchwater_compare_rule(
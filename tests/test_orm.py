@@ -542,6 +542,60 @@ def test_add_genome(tmp_path: str, input_genomes_tiny: Path) -> None:
     assert genome is db_orm.db_genome(session, fasta, md5, create=True)
 
 
+def test_add_genomes_existing(tmp_path: str, input_genomes_tiny: Path) -> None:
+    """Confirm bulk adding genomes leaves pre-existing entries as they were."""
+    session = db_orm.connect_to_db(Path(tmp_path) / "bulk.sqlite")
+    fasta_to_hash = {
+        fasta: file_md5sum(fasta) for fasta in sorted(input_genomes_tiny.glob("*.f*"))
+    }
+    old_fasta, old_md5 = next(iter(fasta_to_hash.items()))
+    session.add(
+        db_orm.Genome(
+            genome_hash=old_md5,
+            path="/mnt/shared/old.fasta",
+            length=12345,
+            description="Original entry",
+        )
+    )
+    session.commit()
+
+    db_orm.add_genomes(session, fasta_to_hash)
+
+    genomes = {_.genome_hash: _ for _ in session.query(db_orm.Genome)}
+    assert sorted(genomes) == sorted(fasta_to_hash.values())
+    old = genomes[old_md5]
+    assert old.path == "/mnt/shared/old.fasta"
+    assert old.length == 12345  # noqa: PLR2004
+    assert old.description == "Original entry"
+    for fasta, md5 in fasta_to_hash.items():
+        if fasta != old_fasta:
+            assert genomes[md5].path == str(fasta)
+            assert genomes[md5].length > 0
+
+
+def test_add_genomes_duplicate_md5(tmp_path: str, input_genomes_tiny: Path) -> None:
+    """Confirm bulk adding two paths with the same MD5 makes one entry."""
+    tmp_dir = Path(tmp_path)
+    session = db_orm.connect_to_db(tmp_dir / "dups.sqlite")
+    fasta = next(input_genomes_tiny.glob("*.f*"))
+    copy = tmp_dir / ("copy_" + fasta.name)
+    copy.symlink_to(fasta)
+    md5 = file_md5sum(fasta)
+
+    db_orm.add_genomes(session, {fasta: md5, copy: md5})
+
+    genome = session.query(db_orm.Genome).one()
+    assert genome.genome_hash == md5
+    assert genome.path == str(fasta)  # first one wins
+
+
+def test_add_genomes_empty(tmp_path: str) -> None:
+    """Confirm bulk adding no genomes is harmless."""
+    session = db_orm.connect_to_db(Path(tmp_path) / "empty.sqlite")
+    db_orm.add_genomes(session, {})
+    assert not session.query(db_orm.Genome).count()
+
+
 def test_add_genome_not_gzipped(tmp_path: str, input_genomes_tiny: Path) -> None:
     """Confirm catches an uncompressed FASTA with .gz extension."""
     tmp_dir = Path(tmp_path)
@@ -0,0 +1,140 @@
+# The MIT License
+#
+# Copyright (c) 2024-2025 University of Strathclyde
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+"""Tests for the pyani_plus/plot_run.py module.
+
+These tests are intended to be run from the repository root using:
+
+pytest -v
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+from scipy.cluster.hierarchy import leaves_list
+
+from pyani_plus import plot_run
+
+LABELS = ["Alpha", "Beta", "Gamma", "Delta", "Epsilon"]
+
+
+@pytest.fixture
+def matrices() -> dict[str, pd.DataFrame]:
+    """Return asymmetric identity and query coverage matrices for five genomes.
+
+    The query coverage is deliberately unrelated to the identity, so that
+    clustering it on its own would give a different ordering.
+    """
+    identity = pd.DataFrame(
+        [
+            [1.00, 0.80, 0.95, 0.70, 0.81],
+            [0.81, 1.00, 0.79, 0.90, 0.97],
+            [0.96, 0.78, 1.00, 0.71, 0.80],
+            [0.69, 0.91, 0.70, 1.00, 0.88],
+            [0.80, 0.96, 0.81, 0.89, 1.00],
+        ],
+        index=LABELS,
+        columns=LABELS,
+    )
+    query_cov = pd.DataFrame(
+        np.random.default_rng(seed=1).uniform(0.5, 1.0, (5, 5)),
+        index=LABELS,
+        columns=LABELS,
+    )
+    return {
+        "identity": identity,
+        "query_cov": query_cov,
+        "hadamard": identity * query_cov,
+    }
+
+
+def test_shared_ordering(matrices: dict[str, pd.DataFrame], tmp_path: str) -> None:
+    """Confirm all the TSV files follow the identity matrix clustering."""
+    order = leaves_list(plot_run.cluster_matrix(matrices["identity"])[0])
+    expected = [LABELS[_] for _ in order]
+    # Otherwise this test would not tell the two orderings apart:
+    assert list(leaves_list(plot_run.cluster_matrix(matrices["query_cov"])[0])) != list(
+        order
+    )
+
+    plot_run.plot_heatmaps(matrices, Path(tmp_path), "test", cores=1)
+
+    for name, matrix in matrices.items():
+        tsv = pd.read_csv(Path(tmp_path) / f"test_{name}.tsv", sep="\t", index_col=0)
+        assert list(tsv.index) == expected, name
+        assert list(tsv.columns) == expected, name
+        pd.testing.assert_frame_equal(tsv, matrix.loc[expected, expected])
+
+
+def test_parallel_matches_serial(
+    matrices: dict[str, pd.DataFrame], tmp_path: str
+) -> None:
+    """Confirm using worker processes gives the same output files."""
+    serial = Path(tmp_path) / "serial"
+    parallel = Path(tmp_path) / "parallel"
+    serial.mkdir()
+    parallel.mkdir()
+    plot_run.plot_heatmaps(matrices, serial, "test", cores=1)
+    plot_run.plot_heatmaps(matrices, parallel, "test", cores=2)
+
+    names = sorted(_.name for _ in serial.iterdir())
+    assert names == sorted(_.name for _ in parallel.iterdir())
+    assert len(names) == len(matrices) * (1 + len(plot_run.IMAGE_FORMATS))
+    for name in names:
+        if name.endswith(".tsv"):
+            assert (serial / name).read_text() == (parallel / name).read_text()
+        elif name.endswith((".png", ".jpg")):
+            # The vector formats embed creation dates, so just compare bitmaps
+            with Image.open(serial / name) as a, Image.open(parallel / name) as b:
+                assert a.size == b.size
+                assert a.tobytes() == b.tobytes(), name
+
+
+def test_single_genome(tmp_path: str) -> None:
+    """Confirm a one-by-one matrix is plotted without clustering."""
+    matrix = pd.DataFrame([[1.0]], index=["Alpha"], columns=["Alpha"])
+    plot_run.plot_heatmaps({"identity": matrix}, Path(tmp_path), "test", cores=2)
+    for ext in plot_run.IMAGE_FORMATS:
+        assert (Path(tmp_path) / f"test_identity.{ext}").stat().st_size
+    assert (Path(tmp_path) / "test_identity.tsv").read_text() == (
+        "\tAlpha\nAlpha\t1.0\n"
+    )
+
+
+def test_write_reordered_tsv_matches_pandas(tmp_path: str) -> None:
+    """Confirm the streamed TSV is identical to pandas to_csv output."""
+    matrix = pd.DataFrame(
+        [
+            [1.0, np.nan, 1e-300, 0.1],
+            [5e-324, 1.0, 0.30000000000000004, np.nan],
+            [np.nan, 2.5e-10, 1.0, 123456789.0],
+            [0.0, -0.0, 1 / 3, 1.0],
+        ],
+        index=LABELS[:4],
+        columns=LABELS[:4],
+    )
+    order = np.array([2, 0, 3, 1])
+    filename = Path(tmp_path) / "reordered.tsv"
+    plot_run.write_reordered_tsv(matrix, order, filename)
+    assert filename.read_text() == matrix.iloc[order, order].to_csv(sep="\t")
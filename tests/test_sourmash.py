@@ -86,14 +86,27 @@ def test_parser_with_bad_branchwater(tmp_path: str) -> None:
     parser = method_sourmash.parse_sourmash_manysearch_csv(
         mock_csv, mock_dict, expected
     )
-    assert next(parser) == ("AAAAAA", "AAAAAA", 1.0, 1.0)
-    assert next(parser) == ("AAAAAA", "BBBBBB", 0.85, 0.9)
+    # The self-vs-self values are all checked before yielding any rows
     with pytest.raises(
         ValueError,
-        match="Expected sourmash manysearch BBBBBB vs self to be one, not 'NaN'",
+        match="Expected sourmash manysearch BBBBBB vs self to be one, not nan",
     ):
         next(parser)
 
+    # Drop the bad self-vs-self line
+    with mock_csv.open("w") as handle:
+        handle.write(
+            "max_containment_ani,query_name,match_name,query_containment_ani\n"
+        )
+        handle.write("\n")  # parser will skip blank lines
+        handle.write("1.0,A.fasta,A.fasta,1.0\n")
+        handle.write("0.9,A.fasta,B.fasta,0.85\n")
+    parser = method_sourmash.parse_sourmash_manysearch_csv(
+        mock_csv, mock_dict, expected
+    )
+    assert next(parser) == ("AAAAAA", "AAAAAA", 1.0, 1.0)
+    assert next(parser) == ("AAAAAA", "BBBBBB", 0.85, 0.9)
+
     # Now tell it just expect one entry...
     parser = method_sourmash.parse_sourmash_manysearch_csv(
         mock_csv, mock_dict, {("AAAAAA", "AAAAAA")}
@@ -57,6 +57,18 @@ def test_md5_invalid() -> None:
         utils.file_md5sum("/does/not/exist.txt")
 
 
+def test_md5sums_order(input_gzip_bacteria: Path, input_genomes_tiny: Path) -> None:
+    """Confirm parallel MD5 checksums are yielded in the input order."""
+    filenames = sorted(input_gzip_bacteria.glob("*.f*")) + sorted(
+        input_genomes_tiny.glob("*.f*")
+    )
+    # The large bacteria come first, so will likely finish hashing last
+    assert len(filenames) > 3  # noqa: PLR2004
+    assert list(utils.file_md5sums(filenames)) == [
+        utils.file_md5sum(_) for _ in filenames
+    ]
+
+
 def test_check_output() -> None:
     """Confirm our subprocess wrapper catches expected failures."""
     # I wanted to check the full stderr, but couldn't get it to work.